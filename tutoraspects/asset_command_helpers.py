@@ -2,18 +2,30 @@
 Helpers for Tutor commands and "do" commands.
 """
 
+import functools
 import glob
+import math
 import os
 import re
 import json
+from concurrent.futures import ProcessPoolExecutor
 from zipfile import ZipFile
-from sqlfmt.api import format_string
-from sqlfmt.mode import Mode
 
 import click
 import yaml
 
+# Only loading goes through libyaml. Its emitter folds long quoted strings
+# differently than the pure Python one, which would rewrite committed assets.
+try:
+    from yaml import CSafeLoader as SafeLoader
+except ImportError:  # libyaml is not available, fall back to the pure Python version
+    from yaml import SafeLoader
+
 FILE_NAME_ATTRIBUTE = "_file_name"
+# Number of assets handed to each worker process at a time when parsing
+PARSE_CHUNKSIZE = 16
+# Matches the numeric suffix Superset adds to exported file names
+FILE_NAME_SUFFIX_RE = re.compile(r"(_\d*)\.yaml")
 
 PLUGIN_PATH = os.path.join(
     os.path.dirname(os.path.abspath(__file__)), "templates", "aspects"
@@ -68,6 +80,13 @@ class Asset:
     def __init__(self):
         if not self.path:
             raise NotImplementedError("Asset is an abstract class.")
+        # These are used for every asset of this type, so prepare them once here:
+        # raw vars are checked for every templated key and omitted vars are
+        # split into their path segments.
+        self._raw_vars = frozenset(self.get_raw_vars())
+        self._omitted_paths = tuple(
+            tuple(var_path.split(".")) for var_path in self.get_omitted_vars()
+        )
 
     def get_path(self, all_assets_path):
         """
@@ -113,20 +132,22 @@ class Asset:
         """
         Remove any variables from the content which should be omitted.
         """
-        for var_path in self.get_omitted_vars():
-            self._remove_content(content, var_path.split("."))
+        for var_path in self._omitted_paths:
+            self._remove_content(content, var_path)
 
-    def _remove_content(self, content: dict, var_path: list):
+    def _remove_content(self, content: dict, var_path: tuple):
         """
         Helper method to remove content from the content dict.
         """
-        if content is None:
-            return
-        if len(var_path) == 1:
-            content.pop(var_path[0], None)
-            return
-        if var_path[0] in content:
-            self._remove_content(content[var_path[0]], var_path[1:])
+        # Walk down to the parent of the last key, stopping if any part is missing
+        node = content
+        for key in var_path[:-1]:
+            if not isinstance(node, dict):
+                return
+            node = node.get(key)
+
+        if isinstance(node, dict):
+            node.pop(var_path[-1], None)
 
     def omit_templated_vars(self, content: dict, existing: dict):
         """
@@ -136,28 +157,26 @@ class Asset:
         if not isinstance(content, dict) or not isinstance(existing, dict):
             return
 
-        for key in content.keys():
-            if key not in existing.keys():
+        raw_vars = self._raw_vars
+        for key, value in content.items():
+            existing_value = existing.get(key)
+            if existing_value is None:
                 continue
-            if isinstance(existing[key], str):
-                if "{{" in existing.get(key, "") or "{%" in existing.get(key, ""):
-                    if key in self.get_raw_vars():
-                        raw_expression = "{% raw %}" + content[key] + "{% endraw %}"
+
+            if isinstance(existing_value, str):
+                if "{{" in existing_value or "{%" in existing_value:
+                    if key in raw_vars:
+                        raw_expression = "{% raw %}" + value + "{% endraw %}"
                         content[key] = raw_expression
                     else:
-                        content[key] = existing[key]
-
-            if isinstance(content[key], dict):
-                self.omit_templated_vars(content[key], existing[key])
-
-            if isinstance(content[key], list):
-                for i, item in enumerate(content[key]):
+                        content[key] = existing_value
+            elif isinstance(value, dict):
+                self.omit_templated_vars(value, existing_value)
+            elif isinstance(value, list) and isinstance(existing_value, list):
+                # Items past the end of the existing list have nothing to compare to
+                for item, existing_item in zip(value, existing_value):
                     if isinstance(item, dict):
-                        try:
-                            tmp = existing[key][i]
-                            self.omit_templated_vars(item, tmp or None)
-                        except IndexError:
-                            pass
+                        self.omit_templated_vars(item, existing_item or None)
 
     def process(self, content: dict, existing: dict):
         """
@@ -179,16 +198,15 @@ class ChartAsset(Asset):
     raw_vars = ["sqlExpression", "query_context", "translate_column"]
 
     def process(self, content: dict, existing: dict):
-        if not content.get("query_context") and existing:
-            content["query_context"] = existing.get("query_context")
+        existing_query_context = existing.get("query_context") if existing else None
+        if not content.get("query_context"):
+            content["query_context"] = existing_query_context
         query_context = content["query_context"]
         if query_context is not None and isinstance(query_context, str):
             content["query_context"] = json.loads(query_context)
         # run templated vars again to update query_context
-        if existing:
-            self.omit_templated_vars(
-                content["query_context"], existing.get("query_context")
-            )
+        if existing_query_context:
+            self.omit_templated_vars(content["query_context"], existing_query_context)
 
 
 class DashboardAsset(Asset):
@@ -221,13 +239,28 @@ class DatasetAsset(Asset):
             if not metric.get("verbose_name"):
                 metric["verbose_name"] = metric["metric_name"].replace("_", " ").title()
 
+        # sqlfmt is slow to import and only needed here, so load it on first use
+        from sqlfmt.api import (  # pylint: disable=import-outside-toplevel
+            format_string,
+        )
+
         content["sql"] = (
-            format_string(content["sql"], mode=Mode(dialect_name="clickhouse"))
+            format_string(content["sql"], mode=_get_sql_mode())
             if "filter indent" not in content["sql"]
             else content["sql"]
         )
 
 
+@functools.lru_cache(maxsize=1)
+def _get_sql_mode():
+    """
+    Return the sqlfmt mode used to format dataset SQL.
+    """
+    from sqlfmt.mode import Mode  # pylint: disable=import-outside-toplevel
+
+    return Mode(dialect_name="clickhouse")
+
+
 class DatabaseAsset(Asset):
     """
     Database assets.
@@ -243,6 +276,27 @@ ASSET_TYPE_MAP = {
     "table_name": DatasetAsset(),
     "database_name": DatabaseAsset(),
 }
+ASSET_TYPE_KEYS = tuple(ASSET_TYPE_MAP)
+
+
+def _get_asset_type_key(content):
+    """
+    Return the ASSET_TYPE_MAP key identifying the asset type, if any.
+
+    The first identifying key found in the content decides the asset type.
+    """
+    return next((key for key in ASSET_TYPE_KEYS if key in content), None)
+
+
+def _get_existing_asset(path):
+    """
+    Return the content of the existing asset file, or None if there isn't one.
+    """
+    try:
+        with open(path, "rb") as stream:
+            return yaml.load(stream, Loader=SafeLoader)
+    except FileNotFoundError:
+        return None
 
 
 def validate_asset_file(
@@ -259,74 +313,78 @@ def validate_asset_file(
     # make sure to not change the dashboard filename if we happen
     # to have a chart with the same name
     if not content.get("dashboard_title"):
-        out_filename_uuid = re.sub(
-            r"(_\d*)\.yaml", f"_{content['uuid'][:6]}.yaml", orig_filename
+        short_uuid = content["uuid"][:6]
+        out_filename_uuid = FILE_NAME_SUFFIX_RE.sub(
+            f"_{short_uuid}.yaml", orig_filename
         )
     else:
-        out_filename_uuid = re.sub(r"(_\d*)\.yaml", ".yaml", orig_filename)
+        out_filename_uuid = FILE_NAME_SUFFIX_RE.sub(".yaml", orig_filename)
     content[FILE_NAME_ATTRIBUTE] = out_filename_uuid
 
-    out_path = None
+    asset_type_key = _get_asset_type_key(content)
+    if asset_type_key is None:
+        # This can happen if it's an unknown asset type
+        return None, False
+
+    cls = ASSET_TYPE_MAP[asset_type_key]
     needs_review = False
-    for key, cls in ASSET_TYPE_MAP.items():
-        if key in content:
-            out_path = cls.get_path(all_assets_path)
-
-            existing = None
-
-            if os.path.exists(os.path.join(out_path, out_filename_uuid)):
-                with open(
-                    os.path.join(out_path, out_filename_uuid), encoding="utf-8"
-                ) as stream:
-                    existing = yaml.safe_load(stream)
-
-            for var in cls.get_templated_vars():
-                # If this is a variable we expect to be templated,
-                # check that it is.
-                if (
-                    content[var]
-                    and not content[var].startswith("{{")
-                    and not content[var].startswith("{%")
-                ):
-                    if existing:
-                        content[var] = existing[var]
-                        needs_review = False
-                    else:
-                        echo(
-                            click.style(
-                                f"WARN: {orig_filename} has "
-                                f"{var} set to {content[var]} instead of a "
-                                f"setting.",
-                                fg="yellow",
-                            )
-                        )
-                        needs_review = True
-
-            for var in cls.get_required_vars():
-                # If this variable is required and doesn't exist, warn.
-                if var not in content:
-                    if existing:
-                        content[var] = existing[var]
-                        needs_review = False
-                    else:
-                        echo(
-                            click.style(
-                                f"WARN: {orig_filename} is missing required "
-                                f"item '{var}'!",
-                                fg="red",
-                            )
-                        )
-                        needs_review = True
-
-            cls.remove_content(content)
-            cls.omit_templated_vars(content, existing)
-            cls.process(content, existing)
-            # We found the correct class, we can stop looking.
-            break
+    out_path = cls.get_path(all_assets_path)
+
+    existing = _get_existing_asset(os.path.join(out_path, out_filename_uuid))
+
+    for var in cls.get_templated_vars():
+        # If this is a variable we expect to be templated,
+        # check that it is.
+        if (
+            content[var]
+            and not content[var].startswith("{{")
+            and not content[var].startswith("{%")
+        ):
+            if existing:
+                content[var] = existing[var]
+                needs_review = False
+            else:
+                echo(
+                    click.style(
+                        f"WARN: {orig_filename} has "
+                        f"{var} set to {content[var]} instead of a "
+                        f"setting.",
+                        fg="yellow",
+                    )
+                )
+                needs_review = True
+
+    for var in cls.get_required_vars():
+        # If this variable is required and doesn't exist, warn.
+        if var not in content:
+            if existing:
+                content[var] = existing[var]
+                needs_review = False
+            else:
+                echo(
+                    click.style(
+                        f"WARN: {orig_filename} is missing required item '{var}'!",
+                        fg="red",
+                    )
+                )
+                needs_review = True
+
+    cls.remove_content(content)
+    # Without an existing file there is nothing to keep templated vars from
+    if existing is not None:
+        cls.omit_templated_vars(content, existing)
+    cls.process(content, existing)
 
     return out_path, needs_review
 
 
+def _load_asset(raw_asset):
+    """
+    Parse the raw contents of an exported asset file.
+    """
+    return yaml.load(raw_asset, Loader=SafeLoader)
+
+
 def import_superset_assets(
     file, echo, assets_path=ASSETS_PATH
 ):  # pylint: disable=too-many-locals
@@ -335,36 +393,56 @@ def import_superset_assets(
     """
     written_assets = []
     review_files = set()
+    created_dirs = set()
     err = 0
     dataset_warn = False
 
     with ZipFile(file.name) as zip_file:
-        for asset_path in zip_file.namelist():
-            if "metadata.yaml" in asset_path:
+        asset_infos = [
+            info
+            for info in zip_file.infolist()
+            if not info.is_dir() and "metadata.yaml" not in info.filename
+        ]
+        asset_paths = [info.filename for info in asset_infos]
+        # Passing the ZipInfo saves looking each entry up by name again
+        raw_assets = [zip_file.read(info) for info in asset_infos]
+
+    # Parsing is done in worker processes, validation stays here since it reads
+    # and compares against the existing asset files.
+    # Don't start more workers than there are chunks to hand out
+    max_workers = max(
+        1, min(os.cpu_count() or 1, math.ceil(len(raw_assets) / PARSE_CHUNKSIZE))
+    )
+    with ProcessPoolExecutor(max_workers=max_workers) as executor:
+        contents = executor.map(_load_asset, raw_assets, chunksize=PARSE_CHUNKSIZE)
+
+        for asset_path, content in zip(asset_paths, contents):
+            out_path, needs_review = validate_asset_file(
+                asset_path, content, echo, assets_path
+            )
+
+            # This can happen if it's an unknown asset type
+            if not out_path:
                 continue
-            with zip_file.open(asset_path) as asset_file:
-                content = yaml.safe_load(asset_file)
-                out_path, needs_review = validate_asset_file(
-                    asset_path, content, echo, assets_path
-                )
 
-                # This can happen if it's an unknown asset type
-                if not out_path:
-                    continue
+            if "dataset" in out_path:
+                dataset_warn = True
 
-                if "dataset" in out_path:
-                    dataset_warn = True
+            if needs_review:
+                review_files.add(content[FILE_NAME_ATTRIBUTE])
 
-                if needs_review:
-                    review_files.add(content[FILE_NAME_ATTRIBUTE])
+            out_path = os.path.join(out_path, content[FILE_NAME_ATTRIBUTE])
+            written_assets.append(out_path)
 
-                out_path = os.path.join(out_path, content[FILE_NAME_ATTRIBUTE])
-                written_assets.append(out_path)
+            # Make sure the various asset subdirectories exist before writing
+            out_dir = os.path.dirname(out_path)
+            if out_dir not in created_dirs:
+                os.makedirs(out_dir, exist_ok=True)
+                created_dirs.add(out_dir)
 
-                # Make sure the various asset subdirectories exist before writing
-                os.makedirs(os.path.dirname(out_path), exist_ok=True)
-                with open(out_path, "w", encoding="utf-8") as out_f:
-                    yaml.dump(content, out_f, encoding="utf-8")
+            # Buffer enough that most assets are written out in a single call
+            with open(out_path, "wb", buffering=1 << 16) as out_f:
+                yaml.dump(content, out_f, encoding="utf-8")
 
     if review_files:
         echo()
@@ -398,7 +476,7 @@ def _get_asset_files():
             # We have to remove the jinja for it to parse
             file_str = file.read()
             file_str = file_str.replace("{{", "").replace("}}", "")
-            asset = yaml.safe_load(file_str)
+            asset = yaml.load(file_str, Loader=SafeLoader)
 
             # Some asset types are lists of one element for some reason
             if isinstance(asset, list):
@@ -545,7 +623,7 @@ def _find_unused_assets():
 
     # Remove uuids from 'all' list that are in ignored yaml
     with open(ASPECT_ASSET_LIST, "r", encoding="utf-8") as file:
-        aspects_assets = yaml.safe_load(file)
+        aspects_assets = yaml.load(file, Loader=SafeLoader)
 
     ignored_uuids = aspects_assets.get("ignored_uuids")
     for asset_type in ignored_uuids:
@@ -567,7 +645,7 @@ def delete_aspects_unused_assets(echo):
     count_unused_uuids = sum(len(uuids) for asset_type, uuids in unused_uuids.items())
     if count_unused_uuids:
         with open(ASPECT_ASSET_LIST, "r", encoding="utf-8") as file:
-            aspects_assets = yaml.safe_load(file)
+            aspects_assets = yaml.load(file, Loader=SafeLoader)
 
         unused_aspects_uuids = aspects_assets.get("unused_uuids")
         for asset_type in unused_aspects_uuids:
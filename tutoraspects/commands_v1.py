@@ -2,7 +2,6 @@
 
 from __future__ import annotations
 
-import string
 import sys
 
 import click
@@ -16,6 +15,25 @@ from tutoraspects.asset_command_helpers import (
     delete_aspects_unused_assets,
 )
 
+# Shell commands run by the jobs below, filled in with str.format.
+_LOAD_XAPI_TEST_DATA_CMD_TEMPLATE = (
+    "echo 'Running script... {config_file}' && "
+    "cd /app/aspects/scripts/ && "
+    "bash clickhouse-demo-xapi-data.sh {config_file} && "
+    "echo 'Done!';"
+)
+_DBT_CMD_TEMPLATE = (
+    "echo 'Making dbt script executable...' && "
+    "echo 'Running dbt, only_changed: {only_changed} command: {command}' && "
+    "bash /app/aspects/scripts/dbt.sh {only_changed} {command} && "
+    "echo 'Done!';"
+)
+_ALEMBIC_CMD_TEMPLATE = (
+    "echo 'Making dbt script executable...' && "
+    "bash /app/aspects/scripts/alembic.sh {command} && "
+    "echo 'Done!';"
+)
+
 
 @click.command()
 @click.option("-c", "--config_file", default="./xapi-db-load-config.yaml")
@@ -26,10 +44,7 @@ def load_xapi_test_data(config_file) -> list[tuple[str, str]]:
     return [
         (
             "aspects",
-            f"echo 'Running script... {config_file}' && "
-            "cd /app/aspects/scripts/ && "
-            f"bash clickhouse-demo-xapi-data.sh {config_file} && "
-            "echo 'Done!';",
+            _LOAD_XAPI_TEST_DATA_CMD_TEMPLATE.format(config_file=config_file),
         ),
     ]
 
@@ -66,17 +81,14 @@ def load_xapi_test_data(config_file) -> list[tuple[str, str]]:
          set this to False.
          """,
 )
-def dbt(only_changed: bool, command: string) -> list[tuple[str, str]]:
+def dbt(only_changed: bool, command: str) -> list[tuple[str, str]]:
     """
     Job that proxies dbt commands to a container which runs them against ClickHouse.
     """
     return [
         (
             "aspects",
-            "echo 'Making dbt script executable...' && "
-            f"echo 'Running dbt, only_changed: {only_changed} command: {command}' && "
-            f"bash /app/aspects/scripts/dbt.sh {only_changed} {command} && "
-            "echo 'Done!';",
+            _DBT_CMD_TEMPLATE.format(only_changed=only_changed, command=command),
         ),
     ]
 
@@ -100,16 +112,14 @@ def dbt(only_changed: bool, command: string) -> list[tuple[str, str]]:
             tutor local do alembic -c "downgrade base" # Downgrade to base migration
          """,
 )
-def alembic(command: string) -> list[tuple[str, str]]:
+def alembic(command: str) -> list[tuple[str, str]]:
     """
     Job that proxies alembic commands to a container which runs them against ClickHouse.
     """
     return [
         (
             "aspects",
-            "echo 'Making dbt script executable...' && "
-            f"bash /app/aspects/scripts/alembic.sh {command} && "
-            "echo 'Done!';",
+            _ALEMBIC_CMD_TEMPLATE.format(command=command),
         ),
     ]
 
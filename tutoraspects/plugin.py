@@ -2,13 +2,14 @@
 
 from __future__ import annotations
 
-import os.path
-import random
-import string
-from glob import glob
+import functools
+import os
+import secrets
+from itertools import groupby
+from operator import itemgetter
+from pathlib import Path
 import typing as t
 
-import bcrypt
 import importlib_resources
 from tutor import hooks
 
@@ -17,6 +18,10 @@ from .commands_v0 import COMMANDS as TUTOR_V0_COMMANDS
 from .commands_v1 import COMMANDS as TUTOR_V1_COMMANDS
 from .commands_v1 import DO_COMMANDS as TUTOR_V1_DO_COMMANDS
 
+# Resolved once and shared by the init tasks, template roots and patches.
+_PKG = importlib_resources.files("tutoraspects")
+TEMPLATES_ROOT = str(_PKG / "templates")
+
 ########################################
 # CONFIGURATION
 ########################################
@@ -398,18 +403,39 @@ hooks.Filters.CONFIG_DEFAULTS.add_items(
 )
 
 # Ralph requires us to write out a file with pre-encrypted values, so we encrypt
-# them here per: https://openfun.github.io/ralph/api/#creating_a_credentials_file
+# them per: https://openfun.github.io/ralph/api/#creating_a_credentials_file
 #
+# Hashing is slow, so it is done by the bcrypt_hash template filter when the
+# unique settings are first rendered rather than every time the plugin is loaded.
 # They will remain unchanged between config saves as usual and the unencrypted
 # passwords will still be able to be printed.
-RALPH_ADMIN_PASSWORD = "".join(random.choice(string.ascii_lowercase) for i in range(36))
-RALPH_LMS_PASSWORD = "".join(random.choice(string.ascii_lowercase) for i in range(36))
-RALPH_ADMIN_HASHED_PASSWORD = bcrypt.hashpw(
-    RALPH_ADMIN_PASSWORD.encode(), bcrypt.gensalt()
-).decode("ascii")
-RALPH_LMS_HASHED_PASSWORD = bcrypt.hashpw(
-    RALPH_LMS_PASSWORD.encode(), bcrypt.gensalt()
-).decode("ascii")
+RALPH_ADMIN_PASSWORD = secrets.token_hex(18)
+RALPH_LMS_PASSWORD = secrets.token_hex(18)
+# The generated passwords above are 36 random hex characters, so bcrypt's key
+# stretching adds next to nothing to their strength. Use a lower cost than the
+# library default of 12, which makes hashing about 4 times faster. Deployments
+# that set their own, weaker, Ralph passwords should raise it by setting
+# ASPECTS_RALPH_BCRYPT_ROUNDS before the hashes are generated.
+RALPH_BCRYPT_ROUNDS = 10
+
+
+@functools.lru_cache()
+def _bcrypt_hash(password: str, rounds: int | None = None) -> str:
+    """
+    Return the bcrypt hash of the given password.
+
+    The cost defaults to RALPH_BCRYPT_ROUNDS.
+    """
+    # Only needed when the unique settings are first rendered, so keep it out of
+    # the plugin import that every Tutor command pays for.
+    import bcrypt  # pylint: disable=import-outside-toplevel
+
+    return bcrypt.hashpw(
+        password.encode(), bcrypt.gensalt(rounds=rounds or RALPH_BCRYPT_ROUNDS)
+    ).decode("ascii")
+
+
+hooks.Filters.ENV_TEMPLATE_FILTERS.add_item(("bcrypt_hash", _bcrypt_hash))
 
 hooks.Filters.CONFIG_UNIQUE.add_items(
     [
@@ -435,10 +461,18 @@ hooks.Filters.CONFIG_UNIQUE.add_items(
         # Ralph Settings
         ("RALPH_ADMIN_USERNAME", "ralph"),
         ("RALPH_ADMIN_PASSWORD", RALPH_ADMIN_PASSWORD),
-        ("RALPH_ADMIN_HASHED_PASSWORD", RALPH_ADMIN_HASHED_PASSWORD),
+        # Unique settings are first rendered without the defaults, so the cost can
+        # only come from the user config.
+        (
+            "RALPH_ADMIN_HASHED_PASSWORD",
+            "{{ RALPH_ADMIN_PASSWORD|bcrypt_hash(ASPECTS_RALPH_BCRYPT_ROUNDS|default(none)) }}",
+        ),
         ("RALPH_LMS_USERNAME", "lms"),
         ("RALPH_LMS_PASSWORD", RALPH_LMS_PASSWORD),
-        ("RALPH_LMS_HASHED_PASSWORD", RALPH_LMS_HASHED_PASSWORD),
+        (
+            "RALPH_LMS_HASHED_PASSWORD",
+            "{{ RALPH_LMS_PASSWORD|bcrypt_hash(ASPECTS_RALPH_BCRYPT_ROUNDS|default(none)) }}",
+        ),
         ######################
         # Superset Settings
         ("SUPERSET_SECRET_KEY", "{{ 24|random_string }}"),
@@ -489,7 +523,7 @@ def _mount_superset_on_build(
     Automatically add superset repo from the host to the build context whenever
     it is added to the `MOUNTS` setting.
     """
-    if os.path.basename(host_path) == "superset":
+    if Path(host_path).name == "superset":
         mounts += [
             ("aspects-superset", "superset"),
         ]
@@ -526,23 +560,33 @@ MY_INIT_TASKS: list[tuple[str, tuple[str, ...], int]] = [
     ("lms", ("aspects", "jobs", "init", "lms", "init-lms.sh"), 97),
 ]
 
+
+def _read_template(template_path: tuple[str, ...]) -> str:
+    """
+    Return the contents of a template, relative to the templates root.
+    """
+    return Path(TEMPLATES_ROOT, *template_path).read_text(encoding="utf-8")
+
+
 # For each task added to MY_INIT_TASKS, we load the task template
 # and add it to the CLI_DO_INIT_TASKS filter, which tells Tutor to
 # run it as part of the `init` job.
 try:
-    for service, template_path, priority in MY_INIT_TASKS:
-        hooks.Filters.COMMANDS_INIT.add_item(
-            (service, template_path)
-        )  # pylint: disable=no-member
+    hooks.Filters.COMMANDS_INIT.add_items(  # pylint: disable=no-member
+        [(service, template_path) for service, template_path, _ in MY_INIT_TASKS]
+    )
 except AttributeError as e:
-    for service, template_path, priority in MY_INIT_TASKS:
-        full_path = os.path.join(
-            str(importlib_resources.files("tutoraspects") / "templates"), *template_path
-        )
-        with open(full_path, encoding="utf-8") as init_task_file:
-            init_task: str = init_task_file.read()
-        hooks.Filters.CLI_DO_INIT_TASKS.add_item(
-            (service, init_task), priority=priority
+    # Filter.add_items takes a single priority, so register the tasks in one
+    # batch per priority.
+    for priority, tasks in groupby(
+        sorted(MY_INIT_TASKS, key=itemgetter(2)), key=itemgetter(2)
+    ):
+        hooks.Filters.CLI_DO_INIT_TASKS.add_items(
+            [
+                (service, _read_template(template_path))
+                for service, template_path, _ in tasks
+            ],
+            priority=priority,
         )
 
 ########################################
@@ -611,7 +655,7 @@ hooks.Filters.IMAGES_PUSH.add_items(
 hooks.Filters.ENV_TEMPLATE_ROOTS.add_items(
     # Root paths for template files, relative to the project root.
     [
-        str(importlib_resources.files("tutoraspects") / "templates"),
+        TEMPLATES_ROOT,
     ]
 )
 
@@ -635,14 +679,15 @@ hooks.Filters.ENV_TEMPLATE_TARGETS.add_items(
 
 # For each file in tutoraspects/patches,
 # apply a patch based on the file's name and contents.
-for path in glob(
-    os.path.join(
-        str(importlib_resources.files("tutoraspects") / "patches"),
-        "*",
+# Like glob("*"), hidden files such as .gitignore are skipped.
+with os.scandir(_PKG / "patches") as patches_dir:
+    hooks.Filters.ENV_PATCHES.add_items(
+        [
+            (entry.name, Path(entry.path).read_text(encoding="utf-8"))
+            for entry in patches_dir
+            if entry.is_file() and not entry.name.startswith(".")
+        ]
     )
-):
-    with open(path, encoding="utf-8") as patch_file:
-        hooks.Filters.ENV_PATCHES.add_item((os.path.basename(path), patch_file.read()))
 
 ########################################
 # CUSTOM JOBS (a.k.a. "do-commands")
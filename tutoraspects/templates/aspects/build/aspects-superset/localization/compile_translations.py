@@ -1,6 +1,7 @@
 import os
 import glob
 import shutil
+from concurrent.futures import ThreadPoolExecutor
 
 import ruamel.yaml
 import ruamel.yaml.comments
@@ -21,6 +22,18 @@ def recursive_sort_mappings(s):
         recursive_sort_mappings(value)
         s.insert(0, key, value)
 
+
+def _load_translations(file_path):
+    """
+    Load a downloaded locale file, returning its language and contents.
+    """
+    lang = file_path.split(os.sep)[-2]
+    # YAML instances hold parser state, so each call needs its own.
+    loader = ruamel.yaml.YAML()
+    with open(file_path, "rb") as asset_file:
+        return lang, loader.load(asset_file)
+
+
 def compile_translations():
     """
     Combine translated files into the single file we use for translation.
@@ -33,21 +46,19 @@ def compile_translations():
     all_translations = ruamel.yaml.comments.CommentedMap()
     yaml_files = glob.glob(os.path.join(translations_path, "**/locale.yaml"))
 
-    for file_path in yaml_files:
-        lang = file_path.split(os.sep)[-2]
-        with open(file_path, "r", encoding="utf-8") as asset_file:
-            loc_str = asset_file.read()
-        loaded_strings = yaml.load(loc_str)
-
-        # Sometimes translated files come back with "en" as the top level
-        # key, but still translated correctly.
-        try:
-            all_translations[lang] = loaded_strings[lang]
-        except KeyError:
-            all_translations[lang] = loaded_strings["en"]
-
-        if None in all_translations[lang]:
-            all_translations[lang].pop(None)
+    # There is one small file per language, so overlap the reads with threads.
+    max_workers = min(32, (os.cpu_count() or 1) * 4)
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        for lang, loaded_strings in executor.map(_load_translations, yaml_files):
+            # Sometimes translated files come back with "en" as the top level
+            # key, but still translated correctly.
+            try:
+                all_translations[lang] = loaded_strings[lang]
+            except KeyError:
+                all_translations[lang] = loaded_strings["en"]
+
+            if None in all_translations[lang]:
+                all_translations[lang].pop(None)
 
     out_path = "/app/localization/locale.yaml"
 
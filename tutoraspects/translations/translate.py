@@ -25,7 +25,8 @@ def command(root, action):
     if action == "extract":
         extract_translations(root)
     elif action == "list":
-        get_text_for_translations(root)
+        # This is a generator, consume it so the extracted text gets printed.
+        list(get_text_for_translations(root))
     else:
         print(f"Unknown action: {action}")
         sys.exit(1)
@@ -2,6 +2,8 @@
 
 import os
 import glob
+import math
+from concurrent.futures import ProcessPoolExecutor
 
 import ruamel.yaml
 import ruamel.yaml.comments
@@ -13,64 +15,71 @@ class TranslatableAsset:
     """A class to represent an asset that can be translated."""
 
     translatable_attributes = []
+    # translatable_attributes split into their path segments, see __init_subclass__
+    translatable_paths = ()
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        cls.translatable_paths = tuple(
+            tuple(var_path.split(".")) for var_path in cls.translatable_attributes
+        )
 
     def __init__(self, asset: dict):
         self.asset = asset
-        for key, value in ASSET_FOLDER_MAPPING.items():
-            if key in asset:
-                self.asset_type = value
-                break
+        key = _get_asset_type_key(asset)
+        if key is not None:
+            self.asset_type = ASSET_FOLDER_MAPPING[key]
 
     def extract_text(self):
         """
         Extract text from an asset.
         """
         strings = []
-        for var_path in self.translatable_attributes:
-            current_strings = self.translate_var(self.asset, var_path.split("."))
+        for var_path in self.translatable_paths:
+            current_strings = self.translate_var(self.asset, var_path)
             if None in current_strings:
                 print(
-                    f"\tFound None in {var_path} for {self.asset_type[0]} {self.asset.get('uuid')}"
+                    f"\tFound None in {'.'.join(var_path)} for {self.asset_type[0]} "
+                    f"{self.asset.get('uuid')}"
                 )
             strings.extend(current_strings)
 
-        return list(filter(lambda a: a is not None, strings))
+        return [string for string in strings if string is not None]
 
-    def translate_var(
-        self, content, var_path
-    ):  # pylint: disable=too-many-return-statements
+    def translate_var(self, content, var_path):
         """
-        Helper method to remove content from the content dict.
+        Return all the values found at var_path in the content.
+
+        Lists are searched item by item and a "*" in the path matches every value
+        of a dict.
         """
-        if not content or isinstance(content, str):
-            return []
-
-        # if content is a list, run method for each list item
-        if isinstance(content, list):
-            strings = []
-            for item in content:
-                strings.extend(self.translate_var(item, var_path))
-            return strings
-
-        if isinstance(content, dict):
-            # if var_path is wild, run method on every value in dict
-            if var_path[0] == "*":
-                strings = []
-                for value in content.values():
-                    strings.extend(self.translate_var(value, var_path[1:]))
-                return strings
-            # if there is only 1 value in var_path, find it in the dict
-            if len(var_path) == 1:
-                strings = []
-                result = content.get(var_path[0])
-                if result:
-                    strings.append(result)
-                return strings
-            # otherwise, run method again 1 level deeper
-            return self.translate_var(content.get(var_path[0], " "), var_path[1:])
-
-        print("Could not translate var_path: ", var_path, content)
-        return []
+        strings = []
+        # Walk the content depth first with an explicit stack, pushing children in
+        # reverse so the values come out in document order.
+        stack = [(content, 0)]
+        while stack:
+            node, depth = stack.pop()
+            if not node or isinstance(node, str):
+                continue
+
+            if isinstance(node, list):
+                stack.extend((item, depth) for item in reversed(node))
+            elif isinstance(node, dict):
+                key = var_path[depth]
+                if key == "*":
+                    stack.extend(
+                        (value, depth + 1) for value in reversed(list(node.values()))
+                    )
+                elif depth == len(var_path) - 1:
+                    result = node.get(key)
+                    if result:
+                        strings.append(result)
+                else:
+                    stack.append((node.get(key, " "), depth + 1))
+            else:
+                print("Could not translate var_path: ", var_path[depth:], node)
+
+        return strings
 
 
 class DashboardAsset(TranslatableAsset):
@@ -114,35 +123,59 @@ ASSET_FOLDER_MAPPING = {
     "table_name": ("datasets", DatasetAsset),
 }
 
+ASSET_TYPE_KEYS = tuple(ASSET_FOLDER_MAPPING)
+
+
+def _get_asset_type_key(asset):
+    """
+    Return the ASSET_FOLDER_MAPPING key identifying the asset type, if any.
+    """
+    return next((key for key in ASSET_TYPE_KEYS if key in asset), None)
+
+
 BASE_PATH = "tutoraspects/templates/aspects/build/aspects-superset/"
+# Number of asset files handed to each worker process at a time
+PARSE_CHUNKSIZE = 16
 
 
 def get_text_for_translations(root_path):
     """
     Extract all translatable text from the Superset assets.
+
+    This is a generator, strings are yielded as each asset is processed.
     """
     assets_path = os.path.join(root_path, BASE_PATH, "openedx-assets/assets/")
     print(f"Assets path: {assets_path}")
 
-    strings = []
-
     yaml_files = glob.glob(os.path.join(assets_path, "**/*.yaml"))
 
-    for yaml_file in yaml_files:
-        with open(yaml_file, "r", encoding="utf-8") as asset_file:
-            asset_str = asset_file.read()
-
-        asset = yaml.load(asset_str)
-        strings.extend(mark_text_for_translation(asset))
-
-    with open(
-        BASE_PATH + "localization/datasets_strings.yaml", "r", encoding="utf-8"
-    ) as file:
-        dataset_strings = yaml.load(file.read())
+    # Parsing the asset files is the bulk of the work here, so spread it over
+    # the available cores, without starting more workers than there are chunks.
+    max_workers = max(
+        1, min(os.cpu_count() or 1, math.ceil(len(yaml_files) / PARSE_CHUNKSIZE))
+    )
+    with ProcessPoolExecutor(max_workers=max_workers) as executor:
+        for file_strings in executor.map(
+            _get_text_for_asset_file, yaml_files, chunksize=PARSE_CHUNKSIZE
+        ):
+            yield from file_strings
+
+    with open(BASE_PATH + "localization/datasets_strings.yaml", "rb") as file:
+        dataset_strings = yaml.load(file)
         for key in dataset_strings:
-            strings.extend(dataset_strings[key])
+            yield from dataset_strings[key]
             print(f"Extracted {len(dataset_strings[key])} strings for dataset {key}")
-    return strings
+
+
+def _get_text_for_asset_file(yaml_file):
+    """
+    Load a single asset file and return its translatable text.
+    """
+    with open(yaml_file, "rb") as asset_file:
+        asset = yaml.load(asset_file)
+
+    # Generators can't be sent back from the worker processes
+    return list(mark_text_for_translation(asset))
 
 
 def mark_text_for_translation(asset):
@@ -150,16 +183,15 @@ def mark_text_for_translation(asset):
     For every asset extract the text and mark it for translation
     """
 
-    for key, (asset_type, Asset) in ASSET_FOLDER_MAPPING.items():
-        if key in asset:
-            strings = Asset(asset).extract_text()
-            print(
-                f"Extracted {len(strings)} strings from {asset_type} {asset.get('uuid')}"
-            )
-            return strings
+    key = _get_asset_type_key(asset)
+    if key is None:
+        # It's a type of asset that we don't translate, yield nothing.
+        return
 
-    # If we get here it's a type of asset that we don't translate, return nothing.
-    return []
+    asset_type, asset_class = ASSET_FOLDER_MAPPING[key]
+    strings = asset_class(asset).extract_text()
+    print(f"Extracted {len(strings)} strings from {asset_type} {asset.get('uuid')}")
+    yield from strings
 
 
 def extract_translations(root_path):
@@ -178,10 +210,10 @@ def extract_translations(root_path):
     strings = set(get_text_for_translations(root_path))
     print(f"Extracted {len(strings)} strings for translation.")
     translations = ruamel.yaml.comments.CommentedMap()
-    translations["en"] = ruamel.yaml.comments.CommentedMap()
-
-    for string in strings:
-        translations["en"][string] = string
+    # recursive_sort_mappings needs ruamel mappings, so wrap the plain dict
+    translations["en"] = ruamel.yaml.comments.CommentedMap(
+        {string: string for string in strings}
+    )
 
     print(f"Writing English strings to {translation_file}")
     with open(translation_file, "w", encoding="utf-8") as file: